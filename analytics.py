@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Analytics for the CLI Task Manager - burndown, weekly throughput, lead time, overdue ages
+Reads the task_stats counts (kept current by triggers) into compact array columns - NumPy if
+it's installed, the array module if not - so the cost depends on the number of days, not tasks.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from itertools import accumulate, groupby
+from math import ceil
+from operator import mul
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional - the stdlib fallback is just a bit slower
+    np = None
+
+EPOCH = date(1970, 1, 1)
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+# (label, min age in days, max age in days) - None means no upper limit
+OVERDUE_BUCKETS = [
+    ('1-7 days', 1, 7),
+    ('8-30 days', 8, 30),
+    ('31-90 days', 31, 90),
+    ('90+ days', 91, None),
+]
+
+# Dates become days since 1970-01-01 inside SQLite; lead-time buckets are already hours
+STATS_QUERY = '''
+    SELECT kind, key, count FROM (
+        SELECT kind,
+               CASE WHEN kind = 'lead' THEN bucket
+                    ELSE CAST(julianday(bucket) - 2440587.5 AS INTEGER) END AS key,
+               count
+        FROM task_stats
+        WHERE count > 0
+    )
+    WHERE key IS NOT NULL
+    ORDER BY kind, key
+'''
+
+
+def _to_array(values):
+    """Turn a sequence of ints into a compact int64 array"""
+    if np is not None:
+        return np.array(values, dtype=np.int64)
+    return array('q', values)
+
+
+class Histogram:
+    """Sorted bucket keys with running totals, so 'how many before x' is one binary search"""
+
+    def __init__(self, keys=(), counts=()):
+        self.keys = _to_array(keys)
+        self.counts = _to_array(counts)
+        if np is not None:
+            self.cumulative = np.concatenate(([0], np.cumsum(self.counts)))
+        else:
+            self.cumulative = array('q', accumulate(self.counts, initial=0))
+
+    @property
+    def total(self):
+        return int(self.cumulative[-1])
+
+    def count_before(self, targets, side='left'):
+        """Items with a key below each target (or at/below it with side='right')"""
+        if np is not None:
+            return self.cumulative[np.searchsorted(self.keys, targets, side=side)].tolist()
+
+        find = bisect_right if side == 'right' else bisect_left
+        return [self.cumulative[find(self.keys, t)] for t in targets]
+
+    def percentile(self, q):
+        """Nearest-rank percentile of the keys, weighted by their counts"""
+        rank = max(1, int(ceil(q / 100 * self.total)))
+        if np is not None:
+            index = int(np.searchsorted(self.cumulative, rank)) - 1
+        else:
+            index = bisect_left(self.cumulative, rank) - 1
+        return int(self.keys[index])
+
+    def mean(self):
+        if np is not None:
+            weighted = int((self.keys * self.counts).sum())
+        else:
+            weighted = sum(map(mul, self.keys, self.counts))
+        return weighted / self.total
+
+
+def load_histograms(conn):
+    """Read task_stats into one Histogram per kind (created, done, lead, due)"""
+    rows = conn.execute(STATS_QUERY).fetchall()
+
+    histograms = {kind: Histogram() for kind in ('created', 'done', 'lead', 'due')}
+    for kind, group in groupby(rows, key=lambda row: row[0]):
+        _, keys, counts = zip(*group)
+        histograms[kind] = Histogram(keys, counts)
+    return histograms
+
+
+def day_number(day=None):
+    """Days since 1970-01-01 for a date (today by default)"""
+    return ((day or date.today()) - EPOCH).days
+
+
+def day_label(day_num):
+    return (EPOCH + timedelta(days=int(day_num))).strftime('%Y-%m-%d')
+
+
+def burndown(histograms, today, days=30):
+    """Open tasks at the end of each of the last `days` days"""
+    day_nums = list(range(today - days + 1, today + 1))
+    opened = histograms['created'].count_before(day_nums, side='right')
+    closed = histograms['done'].count_before(day_nums, side='right')
+    return [(day_label(d), o - c) for d, o, c in zip(day_nums, opened, closed)]
+
+
+def weekly_throughput(histograms, today, weeks=12):
+    """Tasks finished in each of the last `weeks` weeks (weeks start on Monday)"""
+    # 1970-01-01 was a Thursday, hence the +3
+    this_monday = today - (today + 3) % 7
+    starts = [this_monday - 7 * i for i in range(weeks - 1, -1, -1)]
+
+    done = histograms['done']
+    before_start = done.count_before(starts)
+    before_end = done.count_before([s + 7 for s in starts])
+    return [(day_label(s), e - b) for s, e, b in zip(starts, before_end, before_start)]
+
+
+def lead_time_stats(histograms):
+    """Days from created_at to the done updated_at, to the hour, for finished tasks"""
+    lead = histograms['lead']
+    if not lead.total:
+        return {'count': 0, 'mean': 0.0, 'median': 0.0, 'p85': 0.0, 'max': 0.0}
+
+    return {
+        'count': lead.total,
+        'mean': round(lead.mean() / 24, 2),
+        'median': round(lead.percentile(50) / 24, 2),
+        'p85': round(lead.percentile(85) / 24, 2),
+        'max': round(int(lead.keys[-1]) / 24, 2),
+    }
+
+
+def overdue_ages(histograms, today):
+    """How long unfinished tasks have been overdue, bucketed by age in days"""
+    due = histograms['due']
+
+    buckets = {}
+    for label, min_age, max_age in OVERDUE_BUCKETS:
+        latest_due = today - min_age
+        upto_latest = due.count_before([latest_due], side='right')[0]
+        before_earliest = due.count_before([today - max_age])[0] if max_age is not None else 0
+        buckets[label] = upto_latest - before_earliest
+    return buckets
+
+
+def sparkline(values):
+    """Render a list of numbers as a one-line bar chart"""
+    if not values:
+        return ''
+    low, high = min(values), max(values)
+    span = high - low or 1
+    return ''.join(SPARK_CHARS[int((v - low) / span * (len(SPARK_CHARS) - 1))] for v in values)
+
+
+def utc_today(conn):
+    """Today's day number in UTC, the same clock CURRENT_TIMESTAMP fills created_at/updated_at with"""
+    return day_number(date.fromisoformat(conn.execute("SELECT date('now')").fetchone()[0]))
+
+
+def build_report(conn, days=30, weeks=12, today=None):
+    """Compute every analytics series for the tasks table"""
+    today = utc_today(conn) if today is None else today
+    histograms = load_histograms(conn)
+
+    return {
+        'generated_for': day_label(today),
+        'backend': 'numpy' if np is not None else 'array',
+        'tasks': histograms['created'].total,
+        'open': histograms['created'].total - histograms['done'].total,
+        'burndown': burndown(histograms, today, days),
+        'weekly_throughput': weekly_throughput(histograms, today, weeks),
+        'lead_time_days': lead_time_stats(histograms),
+        'overdue_ages': overdue_ages(histograms, today),
+    }
@@ -9,8 +9,12 @@ import argparse
 import sqlite3
 import json
 import csv
+import glob
+import gzip
 import os
+import shutil
 import sys
+import tempfile
 import threading
 import time
 from datetime import datetime, timedelta
@@ -18,6 +22,8 @@ from dateutil import parser as date_parser
 from colorama import init, Fore, Style
 import configparser
 
+import analytics
+
 # Initialize colorama for cross-platform colored output
 init()
 
@@ -70,9 +76,208 @@ class TaskManager:
             )
         ''')
         
+        # Append-only change log so syncs can pull deltas instead of the whole table
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'task_changes'")
+        log_exists = cursor.fetchone() is not None
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS task_changes (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                task_id INTEGER NOT NULL,
+                op TEXT NOT NULL,
+                description TEXT,
+                due_date TEXT,
+                priority TEXT,
+                category TEXT,
+                status TEXT,
+                created_at TEXT,
+                updated_at TEXT,
+                changed_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_task_changes_task_id ON task_changes (task_id)")
+        
+        for op, event, ref in (('insert', 'INSERT', 'NEW'), ('update', 'UPDATE', 'NEW'), ('delete', 'DELETE', 'OLD')):
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS tasks_log_{op} AFTER {event} ON tasks
+                BEGIN
+                    INSERT INTO task_changes (task_id, op, description, due_date, priority,
+                                              category, status, created_at, updated_at)
+                    VALUES ({ref}.id, '{op}', {ref}.description, {ref}.due_date, {ref}.priority,
+                            {ref}.category, {ref}.status, {ref}.created_at, {ref}.updated_at);
+                END
+            ''')
+        
+        # Tasks created before the log existed get one entry each so --since 0 is a full sync
+        if not log_exists:
+            cursor.execute('''
+                INSERT INTO task_changes (task_id, op, description, due_date, priority,
+                                          category, status, created_at, updated_at)
+                SELECT id, 'insert', description, due_date, priority, category, status,
+                       created_at, updated_at
+                FROM tasks ORDER BY id
+            ''')
+        
+        self._init_dependency_tables(cursor)
+        self._init_stats_tables(cursor)
+        
         conn.commit()
         conn.close()
     
+    def _init_dependency_tables(self, cursor):
+        """Create the dependency graph tables and the triggers that keep blocker counts current"""
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS task_dependencies (
+                task_id INTEGER NOT NULL,
+                depends_on_id INTEGER NOT NULL,
+                PRIMARY KEY (task_id, depends_on_id)
+            )
+        ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_task_dependencies_depends_on ON task_dependencies (depends_on_id)")
+        
+        # Number of unfinished dependencies per task, so ready/blocked is a lookup instead of a graph walk
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS task_blockers (
+                task_id INTEGER PRIMARY KEY,
+                open_blockers INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        
+        # Critical path depth per task, rebuilt only when graph_version moves past topo_version
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS task_topo (
+                task_id INTEGER PRIMARY KEY,
+                depth INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute("CREATE TABLE IF NOT EXISTS task_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        cursor.execute("INSERT OR IGNORE INTO task_meta (key, value) VALUES ('graph_version', 0), ('topo_version', -1)")
+        
+        bump_version = "UPDATE task_meta SET value = value + 1 WHERE key = 'graph_version';"
+        
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS task_dependencies_insert AFTER INSERT ON task_dependencies
+            BEGIN
+                INSERT OR IGNORE INTO task_blockers (task_id, open_blockers) VALUES (NEW.task_id, 0);
+                UPDATE task_blockers SET open_blockers = open_blockers + 1
+                WHERE task_id = NEW.task_id
+                  AND (SELECT status FROM tasks WHERE id = NEW.depends_on_id) != 'done';
+                {bump_version}
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS task_dependencies_delete AFTER DELETE ON task_dependencies
+            BEGIN
+                UPDATE task_blockers SET open_blockers = open_blockers - 1
+                WHERE task_id = OLD.task_id
+                  AND (SELECT status FROM tasks WHERE id = OLD.depends_on_id) != 'done';
+                {bump_version}
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS tasks_status_blockers AFTER UPDATE OF status ON tasks
+            WHEN (OLD.status = 'done') != (NEW.status = 'done')
+              AND EXISTS (SELECT 1 FROM task_dependencies WHERE depends_on_id = NEW.id OR task_id = NEW.id)
+            BEGIN
+                UPDATE task_blockers
+                SET open_blockers = open_blockers + (CASE WHEN NEW.status = 'done' THEN -1 ELSE 1 END)
+                WHERE task_id IN (SELECT task_id FROM task_dependencies WHERE depends_on_id = NEW.id);
+                {bump_version}
+            END
+        ''')
+        # The task row is already gone here, so release its dependents before dropping the edges
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS tasks_delete_dependencies AFTER DELETE ON tasks
+            BEGIN
+                UPDATE task_blockers SET open_blockers = open_blockers - 1
+                WHERE OLD.status != 'done'
+                  AND task_id IN (SELECT task_id FROM task_dependencies WHERE depends_on_id = OLD.id);
+                DELETE FROM task_dependencies WHERE task_id = OLD.id OR depends_on_id = OLD.id;
+                DELETE FROM task_blockers WHERE task_id = OLD.id;
+            END
+        ''')
+    
+    def _init_stats_tables(self, cursor):
+        """Create the per-bucket task counts that analytics reads, kept current by triggers"""
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'task_stats'")
+        stats_exist = cursor.fetchone() is not None
+        
+        # bucket has no type so days stay text and lead-time hours stay integers
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS task_stats (
+                kind TEXT NOT NULL,
+                bucket,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (kind, bucket)
+            )
+        ''')
+        
+        # (kind, bucket expression, which rows count, columns it depends on) - {row} is NEW, OLD or tasks.
+        # Lead time is whole seconds divided down to hours: exact, and with no CAST the comparison
+        # has no affinity so it can use the primary key.
+        stats = [
+            ('created', "substr({row}.created_at, 1, 10)", "1", "created_at"),
+            ('done', "substr({row}.updated_at, 1, 10)", "{row}.status = 'done'",
+             "status, created_at, updated_at"),
+            ('lead', "(strftime('%s', {row}.updated_at) - strftime('%s', {row}.created_at)) / 3600",
+             "{row}.status = 'done'", "status, created_at, updated_at"),
+            ('due', "{row}.due_date", "{row}.status != 'done'", "status, created_at, due_date"),
+        ]
+        
+        for kind, bucket, condition, columns in stats:
+            def bucket_for(row):
+                return bucket.format(row=row)
+            
+            def counted(row):
+                return (f"{row}.created_at IS NOT NULL AND ({bucket_for(row)}) IS NOT NULL"
+                        f" AND {condition.format(row=row)}")
+            
+            def adjust(row, delta):
+                statements = []
+                if delta > 0:
+                    statements.append(f"INSERT OR IGNORE INTO task_stats (kind, bucket, count) "
+                                      f"SELECT '{kind}', {bucket_for(row)}, 0 WHERE {counted(row)};")
+                statements.append(f"UPDATE task_stats SET count = count + ({delta}) "
+                                  f"WHERE kind = '{kind}' AND bucket = {bucket_for(row)} AND {counted(row)};")
+                return "\n".join(statements)
+            
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS tasks_stats_{kind}_insert AFTER INSERT ON tasks
+                WHEN {counted('NEW')}
+                BEGIN
+                    {adjust('NEW', 1)}
+                END
+            ''')
+            # Only move the count when the task enters, leaves or changes bucket - most edits don't
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS tasks_stats_{kind}_update AFTER UPDATE OF {columns} ON tasks
+                WHEN ({counted('OLD')}) IS NOT ({counted('NEW')})
+                  OR (({counted('NEW')}) AND ({bucket_for('OLD')}) IS NOT ({bucket_for('NEW')}))
+                BEGIN
+                    {adjust('OLD', -1)}
+                    {adjust('NEW', 1)}
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS tasks_stats_{kind}_delete AFTER DELETE ON tasks
+                WHEN {counted('OLD')}
+                BEGIN
+                    {adjust('OLD', -1)}
+                END
+            ''')
+        
+        # Count the tasks that were there before the stats table existed
+        if not stats_exist:
+            for kind, bucket, condition, _ in stats:
+                bucket = bucket.format(row='tasks')
+                cursor.execute(f'''
+                    INSERT INTO task_stats (kind, bucket, count)
+                    SELECT '{kind}', {bucket}, COUNT(*) FROM tasks
+                    WHERE tasks.created_at IS NOT NULL AND ({bucket}) IS NOT NULL
+                      AND {condition.format(row='tasks')}
+                    GROUP BY 2
+                ''')
+    
     def add_task(self, description, due_date=None, priority=None, category=None):
         """Add a new task to the database"""
         conn = sqlite3.connect(self.db_path)
@@ -127,9 +332,16 @@ class TaskManager:
         cursor = conn.cursor()
         
         # Base query
-        query = "SELECT * FROM tasks WHERE 1=1"
+        query = "SELECT tasks.* FROM tasks"
         params = []
         
+        if sort_by == 'topo':
+            self._refresh_topo_order(cursor)
+            conn.commit()
+            query += " LEFT JOIN task_topo ON task_topo.task_id = tasks.id"
+        
+        query += " WHERE 1=1"
+        
         # Add filters
         if filter_by:
             if filter_by.get('priority'):
@@ -145,10 +357,18 @@ class TaskManager:
                 today = datetime.now().strftime('%Y-%m-%d')
                 query += " AND due_date < ? AND status != 'done'"
                 params.append(today)
+            if filter_by.get('ready'):
+                query += " AND status != 'done' AND id NOT IN (SELECT task_id FROM task_blockers WHERE open_blockers > 0)"
+            if filter_by.get('blocked'):
+                query += " AND status != 'done' AND id IN (SELECT task_id FROM task_blockers WHERE open_blockers > 0)"
         
         # Add sorting - مش أسرع query بس كفاية للمشروع ده
         if sort_by == 'priority':
             query += " ORDER BY CASE priority WHEN 'high' THEN 1 WHEN 'medium' THEN 2 WHEN 'low' THEN 3 END"
+        elif sort_by == 'topo':
+            # Longest chain of waiting work first - a blocker is always deeper than what it blocks
+            query += (" ORDER BY CASE WHEN status = 'done' THEN 1 ELSE 0 END, COALESCE(task_topo.depth, 1) DESC,"
+                      " CASE priority WHEN 'high' THEN 1 WHEN 'medium' THEN 2 WHEN 'low' THEN 3 END, due_date ASC")
         elif sort_by == 'due_date':
             query += " ORDER BY due_date ASC"
         else:
@@ -179,6 +399,139 @@ class TaskManager:
             
             print(f"{task_id:<4} {desc_short:<30} {due_str:<12} {priority_color}{priority:<8}{Style.RESET_ALL} {category:<12} {status_color}{status:<10}{Style.RESET_ALL}")
     
+    def _refresh_topo_order(self, cursor):
+        """Rebuild the cached critical path depths if the dependency graph changed since last time"""
+        cursor.execute("SELECT key, value FROM task_meta WHERE key IN ('graph_version', 'topo_version')")
+        versions = dict(cursor.fetchall())
+        if versions['graph_version'] == versions['topo_version']:
+            return
+        
+        # Only edges between unfinished tasks matter for what's left to do
+        cursor.execute('''
+            SELECT d.task_id, d.depends_on_id
+            FROM task_dependencies d
+            JOIN tasks t ON t.id = d.task_id
+            JOIN tasks b ON b.id = d.depends_on_id
+            WHERE t.status != 'done' AND b.status != 'done'
+        ''')
+        dependents = {}
+        blockers = {}
+        for task_id, depends_on_id in cursor.fetchall():
+            dependents.setdefault(depends_on_id, []).append(task_id)
+            blockers.setdefault(task_id, []).append(depends_on_id)
+        
+        # Walk from the tasks nothing waits on back to their blockers (Kahn's algorithm, reversed)
+        nodes = set(dependents) | set(blockers)
+        waiting = {node: len(dependents.get(node, [])) for node in nodes}
+        queue = [node for node in nodes if waiting[node] == 0]
+        depth = {}
+        while queue:
+            node = queue.pop()
+            depth[node] = 1 + max((depth[d] for d in dependents.get(node, [])), default=0)
+            for blocker in blockers.get(node, []):
+                waiting[blocker] -= 1
+                if waiting[blocker] == 0:
+                    queue.append(blocker)
+        
+        cursor.execute("DELETE FROM task_topo")
+        cursor.executemany("INSERT INTO task_topo (task_id, depth) VALUES (?, ?)", depth.items())
+        cursor.execute("UPDATE task_meta SET value = ? WHERE key = 'topo_version'", (versions['graph_version'],))
+    
+    def add_dependency(self, task_id, depends_on_id):
+        """Mark task_id as blocked by depends_on_id"""
+        if task_id == depends_on_id:
+            print(f"{Fore.RED}A task can't depend on itself.{Style.RESET_ALL}")
+            return False
+        
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT id FROM tasks WHERE id IN (?, ?)", (task_id, depends_on_id))
+        found = {row[0] for row in cursor.fetchall()}
+        for missing in (task_id, depends_on_id):
+            if missing not in found:
+                print(f"{Fore.RED}Task with ID {missing} not found.{Style.RESET_ALL}")
+                conn.close()
+                return False
+        
+        # If the blocker already (indirectly) depends on this task, the new edge would close a loop
+        cursor.execute('''
+            WITH RECURSIVE reachable(id) AS (
+                SELECT ?
+                UNION
+                SELECT d.depends_on_id FROM task_dependencies d JOIN reachable r ON d.task_id = r.id
+            )
+            SELECT 1 FROM reachable WHERE id = ?
+        ''', (depends_on_id, task_id))
+        if cursor.fetchone():
+            print(f"{Fore.RED}Task {depends_on_id} already depends on task {task_id} - that would be a cycle.{Style.RESET_ALL}")
+            conn.close()
+            return False
+        
+        cursor.execute("INSERT OR IGNORE INTO task_dependencies (task_id, depends_on_id) VALUES (?, ?)",
+                       (task_id, depends_on_id))
+        if cursor.rowcount > 0:
+            conn.commit()
+            print(f"{Fore.GREEN}✓ Task {task_id} is now blocked by task {depends_on_id}{Style.RESET_ALL}")
+            result = True
+        else:
+            print(f"{Fore.YELLOW}Task {task_id} already depends on task {depends_on_id}.{Style.RESET_ALL}")
+            result = False
+        
+        conn.close()
+        return result
+    
+    def remove_dependency(self, task_id, depends_on_id):
+        """Remove the dependency of task_id on depends_on_id"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute("DELETE FROM task_dependencies WHERE task_id = ? AND depends_on_id = ?",
+                       (task_id, depends_on_id))
+        if cursor.rowcount > 0:
+            conn.commit()
+            print(f"{Fore.GREEN}✓ Task {task_id} no longer depends on task {depends_on_id}{Style.RESET_ALL}")
+            result = True
+        else:
+            print(f"{Fore.RED}Task {task_id} doesn't depend on task {depends_on_id}.{Style.RESET_ALL}")
+            result = False
+        
+        conn.close()
+        return result
+    
+    def show_dependencies(self, task_id):
+        """Show what a task is blocked by and what it blocks"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT t.* FROM task_dependencies d JOIN tasks t ON t.id = d.depends_on_id
+            WHERE d.task_id = ? ORDER BY t.id
+        ''', (task_id,))
+        blocked_by = cursor.fetchall()
+        
+        cursor.execute('''
+            SELECT t.* FROM task_dependencies d JOIN tasks t ON t.id = d.task_id
+            WHERE d.depends_on_id = ? ORDER BY t.id
+        ''', (task_id,))
+        blocks = cursor.fetchall()
+        
+        cursor.execute("SELECT open_blockers FROM task_blockers WHERE task_id = ?", (task_id,))
+        row = cursor.fetchone()
+        open_blockers = row[0] if row else 0
+        conn.close()
+        
+        if not blocked_by and not blocks:
+            print(f"{Fore.YELLOW}Task {task_id} has no dependencies.{Style.RESET_ALL}")
+            return
+        
+        if blocked_by:
+            print(f"\n{Fore.CYAN}Task {task_id} is blocked by ({open_blockers} not done):{Style.RESET_ALL}")
+            self._display_tasks_from_results(blocked_by)
+        if blocks:
+            print(f"\n{Fore.CYAN}Task {task_id} blocks:{Style.RESET_ALL}")
+            self._display_tasks_from_results(blocks)
+    
     def update_task(self, task_id, **kwargs):
         """Update task fields by ID"""
         conn = sqlite3.connect(self.db_path)
@@ -325,8 +678,54 @@ class TaskManager:
         
         conn.close()
     
-    def export_tasks(self, format_type='json', filename=None):
-        """Export tasks to JSON or CSV"""
+    def show_analytics(self, days=30, weeks=12, as_json=False):
+        """Burndown, throughput, lead time and overdue-age analytics"""
+        conn = sqlite3.connect(self.db_path)
+        report = analytics.build_report(conn, days, weeks)
+        conn.close()
+        
+        if as_json:
+            print(json.dumps(report, indent=2))
+            return report
+        
+        burndown = [count for _, count in report['burndown']]
+        throughput = [count for _, count in report['weekly_throughput']]
+        lead = report['lead_time_days']
+        
+        print(f"\n{Fore.CYAN}📈 Task Analytics ({report['generated_for']}, {report['tasks']} tasks){Style.RESET_ALL}")
+        print("=" * 40)
+        
+        if burndown:
+            print(f"Burndown ({days}d):   {Fore.YELLOW}{analytics.sparkline(burndown)}{Style.RESET_ALL}"
+                  f"  {burndown[0]} → {burndown[-1]} open")
+        if throughput:
+            print(f"Done per week ({weeks}w): {Fore.GREEN}{analytics.sparkline(throughput)}{Style.RESET_ALL}"
+                  f"  last week {throughput[-1]}, avg {sum(throughput) / len(throughput):.1f}")
+        
+        if lead['count']:
+            print(f"Lead time: median {lead['median']}d, p85 {lead['p85']}d, "
+                  f"mean {lead['mean']}d, max {lead['max']}d ({lead['count']} done)")
+        else:
+            print("Lead time: no finished tasks yet")
+        
+        overdue = report['overdue_ages']
+        total_overdue = sum(overdue.values())
+        if total_overdue:
+            print(f"⚠️  Overdue by age ({Fore.RED}{total_overdue}{Style.RESET_ALL} tasks):")
+            widest = max(overdue.values())
+            for label, count in overdue.items():
+                bar = "█" * round(count / widest * 30) if widest else ""
+                print(f"  {label:<11} {Fore.RED}{bar}{Style.RESET_ALL} {count}")
+        else:
+            print(f"Overdue: {Fore.GREEN}none{Style.RESET_ALL}")
+        
+        return report
+    
+    def export_tasks(self, format_type='json', filename=None, since=None):
+        """Export tasks to JSON or CSV, or only the changes after a cursor"""
+        if since is not None:
+            return self.export_changes(since, filename)
+        
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
@@ -376,12 +775,141 @@ class TaskManager:
         except Exception as e:
             print(f"{Fore.RED}Error exporting tasks: {e}{Style.RESET_ALL}")
     
-    def import_tasks(self, filename):
+    def export_changes(self, since=0, filename=None):
+        """Export task changes with a sequence number greater than `since` as JSON"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        # Only the latest change per task matters to a mirror - seq is the rowid so this is a range scan
+        cursor.execute('''
+            SELECT seq, task_id, op, description, due_date, priority, category,
+                   status, created_at, updated_at
+            FROM task_changes
+            WHERE seq IN (SELECT MAX(seq) FROM task_changes WHERE seq > ? GROUP BY task_id)
+            ORDER BY seq
+        ''', (since,))
+        changes = cursor.fetchall()
+        conn.close()
+        
+        # The newest exported change is the cursor - reading MAX(seq) separately could skip
+        # changes committed between the two queries
+        cursor_seq = changes[-1][0] if changes else since
+        
+        if not filename:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            filename = f"tasks_changes_{since}_{timestamp}.json"
+        
+        change_list = []
+        for change in changes:
+            seq, task_id, op = change[0], change[1], change[2]
+            if op == 'delete':
+                # Tombstone - the mirror only needs to know which task went away
+                change_list.append({'seq': seq, 'op': op, 'id': task_id})
+                continue
+            change_list.append({
+                'seq': seq,
+                'op': op,
+                'id': task_id,
+                'description': change[3],
+                'due_date': change[4],
+                'priority': change[5],
+                'category': change[6],
+                'status': change[7],
+                'created_at': change[8],
+                'updated_at': change[9]
+            })
+        
+        try:
+            with open(filename, 'w') as f:
+                json.dump({'since': since, 'cursor': cursor_seq, 'changes': change_list}, f, indent=2)
+        except Exception as e:
+            print(f"{Fore.RED}Error exporting changes: {e}{Style.RESET_ALL}")
+            return None
+        
+        print(f"{Fore.GREEN}✓ Exported {len(change_list)} change(s) to {filename}{Style.RESET_ALL}")
+        print(f"  Next sync: --since {cursor_seq}")
+        return cursor_seq
+    
+    def apply_changes(self, filename):
+        """Apply a change file made by export_changes to this database"""
+        with open(filename, 'r') as f:
+            data = json.load(f)
+        
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        applied = 0
+        for change in data.get('changes', []):
+            if change['op'] == 'delete':
+                cursor.execute("DELETE FROM tasks WHERE id = ?", (change['id'],))
+            else:
+                cursor.execute('''
+                    INSERT INTO tasks (id, description, due_date, priority, category,
+                                       status, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        description = excluded.description,
+                        due_date = excluded.due_date,
+                        priority = excluded.priority,
+                        category = excluded.category,
+                        status = excluded.status,
+                        created_at = excluded.created_at,
+                        updated_at = excluded.updated_at
+                ''', (
+                    change['id'],
+                    change.get('description', ''),
+                    change.get('due_date'),
+                    change.get('priority', 'medium'),
+                    change.get('category', 'personal'),
+                    change.get('status', 'todo'),
+                    change.get('created_at'),
+                    change.get('updated_at')
+                ))
+            applied += 1
+        
+        conn.commit()
+        conn.close()
+        
+        print(f"{Fore.GREEN}✓ Applied {applied} change(s) from {filename}{Style.RESET_ALL}")
+        print(f"  Source cursor: {data.get('cursor', 0)}")
+        return True
+    
+    def compact_change_log(self, before=None):
+        """Shrink the change log to the latest entry per task, optionally dropping entries up to `before`"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        # Older entries for a task are shadowed by its latest one, so delta exports don't change
+        cursor.execute('''
+            DELETE FROM task_changes
+            WHERE seq NOT IN (SELECT MAX(seq) FROM task_changes GROUP BY task_id)
+        ''')
+        removed = cursor.rowcount
+        
+        if before is not None:
+            # Every mirror is past this cursor, so nobody will ask for these again
+            cursor.execute("DELETE FROM task_changes WHERE seq <= ?", (before,))
+            removed += cursor.rowcount
+        
+        conn.commit()
+        conn.close()
+        
+        print(f"{Fore.GREEN}✓ Removed {removed} change log entries{Style.RESET_ALL}")
+        return removed
+    
+    def import_tasks(self, filename, apply_changes=False):
         """Import tasks from JSON or CSV file"""
         if not os.path.exists(filename):
             print(f"{Fore.RED}File {filename} not found.{Style.RESET_ALL}")
             return
         
+        if apply_changes:
+            try:
+                self.apply_changes(filename)
+            except Exception as e:
+                print(f"{Fore.RED}Error applying changes: {e}{Style.RESET_ALL}")
+            return
+        
         try:
             if filename.endswith('.json'):
                 with open(filename, 'r') as f:
@@ -415,6 +943,167 @@ class TaskManager:
         except Exception as e:
             print(f"{Fore.RED}Error importing tasks: {e}{Style.RESET_ALL}")
     
+    def backup_database(self, backup_dir='backups', keep=5, compress=False, pages=1024, max_restarts=10):
+        """Take an online snapshot of the database with SQLite's backup API"""
+        os.makedirs(backup_dir, exist_ok=True)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        snapshot = os.path.join(backup_dir, f"tasks_backup_{timestamp}.db")
+        
+        src = None
+        dst = None
+        page_count = 0
+        restarts = 0
+        last_remaining = None
+        
+        def _progress(status, remaining, total):
+            nonlocal page_count, restarts, last_remaining
+            page_count = total
+            # SQLite starts the copy over whenever another connection writes between steps,
+            # so a steady stream of writes would keep it going forever
+            if last_remaining is not None and remaining > last_remaining:
+                restarts += 1
+                if restarts > max_restarts:
+                    raise RuntimeError(f"database changed during the copy {restarts} times")
+            last_remaining = remaining
+        
+        start = time.time()
+        try:
+            src = sqlite3.connect(self.db_path)
+            dst = sqlite3.connect(snapshot)
+            try:
+                # Copy a few pages per step so writers only wait for one step, not the whole file
+                src.backup(dst, pages=pages, progress=_progress, sleep=0.005)
+            except Exception:
+                if restarts <= max_restarts:
+                    raise
+                if src.execute("PRAGMA journal_mode").fetchone()[0] != 'wal':
+                    raise RuntimeError(f"writes kept restarting the copy ({restarts} restarts) - "
+                                       f"try again when it's quieter or switch the database to WAL mode")
+                # In WAL mode one long read doesn't block writers, so finish in a single step
+                print(f"{Fore.YELLOW}Writes kept restarting the copy, finishing it in one step (WAL mode){Style.RESET_ALL}")
+                src.backup(dst, pages=-1)
+            elapsed = time.time() - start
+            integrity = dst.execute("PRAGMA integrity_check").fetchone()[0]
+        except Exception as e:
+            integrity = None
+            print(f"{Fore.RED}Error backing up database: {e}{Style.RESET_ALL}")
+        finally:
+            if dst:
+                dst.close()
+            if src:
+                src.close()
+        
+        if integrity is None:
+            if os.path.exists(snapshot):
+                os.remove(snapshot)
+            return None
+        
+        if integrity != 'ok':
+            os.remove(snapshot)
+            print(f"{Fore.RED}Snapshot failed integrity check: {integrity}{Style.RESET_ALL}")
+            return None
+        
+        size = os.path.getsize(snapshot)
+        if compress:
+            with open(snapshot, 'rb') as f_in, gzip.open(snapshot + '.gz', 'wb') as f_out:
+                shutil.copyfileobj(f_in, f_out)
+            os.remove(snapshot)
+            snapshot += '.gz'
+        
+        throughput = size / (1024 * 1024) / elapsed if elapsed > 0 else 0
+        print(f"{Fore.GREEN}✓ Backup written to {snapshot}{Style.RESET_ALL}")
+        print(f"  {page_count} pages, {size / (1024 * 1024):.1f} MB in {elapsed:.2f}s ({throughput:.1f} MB/s)")
+        
+        self._rotate_backups(backup_dir, keep)
+        return snapshot
+    
+    def _rotate_backups(self, backup_dir, keep):
+        """Delete the oldest snapshots so only the newest `keep` remain"""
+        if keep <= 0:
+            return
+        
+        # Timestamped names sort oldest first
+        snapshots = sorted(glob.glob(os.path.join(backup_dir, 'tasks_backup_*.db*')),
+                           key=os.path.basename)
+        for old in snapshots[:-keep]:
+            os.remove(old)
+            print(f"{Fore.YELLOW}Removed old backup {old}{Style.RESET_ALL}")
+    
+    def restore_database(self, snapshot, pages=1024):
+        """Restore the database from a snapshot made by backup_database"""
+        if not os.path.exists(snapshot):
+            print(f"{Fore.RED}File {snapshot} not found.{Style.RESET_ALL}")
+            return False
+        
+        source_path = snapshot
+        try:
+            if snapshot.endswith('.gz'):
+                # Hidden temp name so a leftover can never be picked up by backup rotation
+                fd, source_path = tempfile.mkstemp(prefix='.restore_', suffix='.db',
+                                                   dir=os.path.dirname(snapshot) or '.')
+                with gzip.open(snapshot, 'rb') as f_in, os.fdopen(fd, 'wb') as f_out:
+                    shutil.copyfileobj(f_in, f_out)
+            
+            src = sqlite3.connect(source_path)
+            dst = None
+            try:
+                # Don't overwrite good data with a broken snapshot
+                integrity = src.execute("PRAGMA integrity_check").fetchone()[0]
+                if integrity != 'ok':
+                    print(f"{Fore.RED}Snapshot failed integrity check: {integrity}{Style.RESET_ALL}")
+                    return False
+                
+                dst = sqlite3.connect(self.db_path)
+                # What mirrors may already have seen, so the restore can be logged as new changes
+                known_ids = {row[0] for row in dst.execute("SELECT id FROM tasks UNION SELECT task_id FROM task_changes")}
+                sequences = dict(dst.execute("SELECT name, seq FROM sqlite_sequence WHERE name IN ('tasks', 'task_changes')"))
+                
+                src.backup(dst, pages=pages, sleep=0.005)
+            finally:
+                if dst:
+                    dst.close()
+                src.close()
+            
+            # Older snapshots might miss the log or trigger tables
+            self.init_database()
+            self._log_restore(known_ids, sequences)
+        except Exception as e:
+            print(f"{Fore.RED}Error restoring database: {e}{Style.RESET_ALL}")
+            return False
+        finally:
+            if source_path != snapshot and os.path.exists(source_path):
+                os.remove(source_path)
+        
+        print(f"{Fore.GREEN}✓ Database restored from {snapshot}{Style.RESET_ALL}")
+        return True
+    
+    def _log_restore(self, known_ids, sequences):
+        """Record a restore in the change log so `export --since` mirrors pick it up"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        # The snapshot rolled the AUTOINCREMENT counters back - move them past everything already
+        # handed out so no sequence number or task ID gets reused
+        for name, seq in sequences.items():
+            cursor.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?", (seq, name))
+            if cursor.rowcount == 0:
+                cursor.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (name, seq))
+        
+        # Tombstones for tasks the restore removed, then every surviving task logged again
+        restored_ids = {row[0] for row in cursor.execute("SELECT id FROM tasks")}
+        cursor.executemany("INSERT INTO task_changes (task_id, op) VALUES (?, 'delete')",
+                           ((task_id,) for task_id in sorted(known_ids - restored_ids)))
+        cursor.execute('''
+            INSERT INTO task_changes (task_id, op, description, due_date, priority,
+                                      category, status, created_at, updated_at)
+            SELECT id, 'update', description, due_date, priority, category, status,
+                   created_at, updated_at
+            FROM tasks ORDER BY id
+        ''')
+        
+        conn.commit()
+        conn.close()
+    
     def start_reminders(self):
         """Start background reminder thread - الreminders دي كانت صعبة في الأول بصراحة"""
         if self.reminder_thread and self.reminder_thread.is_alive():
@@ -544,6 +1233,14 @@ class TaskManager:
                 print(f"{Fore.RED}Error: {e}{Style.RESET_ALL}")
 
 
+def positive_int(value):
+    """argparse type for options that have to be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
 def main():
     """Main function to handle command line arguments and interactive mode"""
     parser = argparse.ArgumentParser(description="Umar's CLI Task Manager - عشان أنظم حياتي شوية")
@@ -564,7 +1261,10 @@ def main():
     list_parser.add_argument('--category', help='Filter by category')
     list_parser.add_argument('--status', choices=['todo', 'in-progress', 'done'], help='Filter by status')
     list_parser.add_argument('--overdue', action='store_true', help='Show only overdue tasks')
-    list_parser.add_argument('--sort', choices=['due_date', 'priority', 'id'], default='due_date', help='Sort by field')
+    list_parser.add_argument('--ready', action='store_true', help='Show only tasks whose dependencies are all done')
+    list_parser.add_argument('--blocked', action='store_true', help='Show only tasks waiting on other tasks')
+    list_parser.add_argument('--sort', choices=['due_date', 'priority', 'id', 'topo'], default='due_date',
+                             help='Sort by field (topo = dependency order, longest chain first)')
     
     # Update task command
     update_parser = subparsers.add_parser('update', help='Update a task')
@@ -580,6 +1280,18 @@ def main():
     delete_parser.add_argument('id', nargs='?', help='Task ID (or use --last)')
     delete_parser.add_argument('--last', action='store_true', help='Delete the last added task')
     
+    # Dependencies command
+    deps_parser = subparsers.add_parser('deps', help='Manage task dependencies')
+    deps_subparsers = deps_parser.add_subparsers(dest='deps_command', help='Dependency commands')
+    deps_add_parser = deps_subparsers.add_parser('add', help='Mark a task as blocked by another')
+    deps_add_parser.add_argument('id', type=int, help='Task ID that is blocked')
+    deps_add_parser.add_argument('blocker', type=int, help='Task ID it waits on')
+    deps_remove_parser = deps_subparsers.add_parser('remove', help='Remove a dependency')
+    deps_remove_parser.add_argument('id', type=int, help='Task ID that is blocked')
+    deps_remove_parser.add_argument('blocker', type=int, help='Task ID it waits on')
+    deps_show_parser = deps_subparsers.add_parser('show', help='Show what a task blocks and is blocked by')
+    deps_show_parser.add_argument('id', type=int, help='Task ID')
+    
     # Search command
     search_parser = subparsers.add_parser('search', help='Search tasks')
     search_parser.add_argument('keyword', help='Keyword to search for')
@@ -587,14 +1299,40 @@ def main():
     # Report command
     report_parser = subparsers.add_parser('report', help='Generate task report')
     
+    # Analytics command
+    analytics_parser = subparsers.add_parser('analytics', help='Burndown, throughput, lead time and overdue trends')
+    analytics_parser.add_argument('--days', type=int, default=30, help='Days of burndown to show')
+    analytics_parser.add_argument('--weeks', type=int, default=12, help='Weeks of throughput to show')
+    analytics_parser.add_argument('--json', action='store_true', help='Print the series as JSON')
+    
     # Export command
     export_parser = subparsers.add_parser('export', help='Export tasks')
     export_parser.add_argument('--format', choices=['json', 'csv'], default='json', help='Export format')
     export_parser.add_argument('--file', help='Output filename')
+    export_parser.add_argument('--since', type=int, help='Only export changes after this sequence number (JSON only)')
     
     # Import command
     import_parser = subparsers.add_parser('import', help='Import tasks')
     import_parser.add_argument('file', help='File to import from')
+    import_parser.add_argument('--apply-changes', action='store_true', help='Apply a change file from export --since')
+    
+    # Change log compaction command
+    compact_parser = subparsers.add_parser('compact-log', help='Compact the change log')
+    compact_parser.add_argument('--before', type=int, help='Also drop all entries up to this sequence number')
+    
+    # Backup command
+    backup_parser = subparsers.add_parser('backup', help='Take an online snapshot of the database')
+    backup_parser.add_argument('--dir', default='backups', help='Directory to keep snapshots in')
+    backup_parser.add_argument('--keep', type=int, default=5, help='Number of snapshots to keep (0 keeps all)')
+    backup_parser.add_argument('--compress', action='store_true', help='Gzip the snapshot')
+    backup_parser.add_argument('--pages', type=positive_int, default=1024, help='Pages copied per step')
+    backup_parser.add_argument('--max-restarts', type=int, default=10,
+                               help='Give up (or finish in one step in WAL mode) after this many restarts caused by writes')
+    
+    # Restore command
+    restore_parser = subparsers.add_parser('restore', help='Restore the database from a snapshot')
+    restore_parser.add_argument('file', help='Snapshot file (.db or .db.gz)')
+    restore_parser.add_argument('--pages', type=positive_int, default=1024, help='Pages copied per step')
     
     # Reminders command
     reminder_parser = subparsers.add_parser('reminders', help='Start reminder system')
@@ -616,6 +1354,8 @@ def main():
             if args.category: filter_by['category'] = args.category
             if args.status: filter_by['status'] = args.status
             if args.overdue: filter_by['overdue'] = True
+            if args.ready: filter_by['ready'] = True
+            if args.blocked: filter_by['blocked'] = True
             
             tm.list_tasks(filter_by if filter_by else None, args.sort)
         elif args.command == 'update':
@@ -634,14 +1374,34 @@ def main():
                 tm.delete_task(int(args.id))
             else:
                 print(f"{Fore.RED}لازم تكتب الـ ID أو تستخدم --last{Style.RESET_ALL}")
+        elif args.command == 'deps':
+            if args.deps_command == 'add':
+                tm.add_dependency(args.id, args.blocker)
+            elif args.deps_command == 'remove':
+                tm.remove_dependency(args.id, args.blocker)
+            elif args.deps_command == 'show':
+                tm.show_dependencies(args.id)
+            else:
+                print(f"{Fore.RED}استخدم: deps add / deps remove / deps show{Style.RESET_ALL}")
         elif args.command == 'search':
             tm.search_tasks(args.keyword)
         elif args.command == 'report':
             tm.generate_report()
+        elif args.command == 'analytics':
+            tm.show_analytics(args.days, args.weeks, args.json)
         elif args.command == 'export':
-            tm.export_tasks(args.format, args.file)
+            if args.since is not None and args.format != 'json':
+                print(f"{Fore.RED}--since only supports JSON, use --format json{Style.RESET_ALL}")
+                sys.exit(1)
+            tm.export_tasks(args.format, args.file, args.since)
         elif args.command == 'import':
-            tm.import_tasks(args.file)
+            tm.import_tasks(args.file, args.apply_changes)
+        elif args.command == 'compact-log':
+            tm.compact_change_log(args.before)
+        elif args.command == 'backup':
+            tm.backup_database(args.dir, args.keep, args.compress, args.pages, args.max_restarts)
+        elif args.command == 'restore':
+            tm.restore_database(args.file, args.pages)
         elif args.command == 'reminders':
             tm.start_reminders()
             try: